@@ -0,0 +1,28 @@
+"""Program entry point.
+
+Version queries are answered here directly, without importing the command-line
+interface, which would otherwise load `click` and `rich` just to print one line.
+"""
+
+import sys
+
+from . import VERSION
+
+VERSION_FLAGS = ("--version", "-v")
+"""Flags that make the program print its version and exit."""
+
+
+def main() -> None:
+    """Run the program."""
+    if len(sys.argv) == 2 and sys.argv[1] in VERSION_FLAGS:
+        # Matches the output of click.version_option in cli.commands.
+        print(f"circuitpython-tool, version {VERSION}")
+        return
+
+    from .cli.commands import main as cli_main
+
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Code common to modules in this package."""
 
 from collections.abc import Iterable
+from importlib import import_module
 from platform import system
 from sys import exit
 from typing import Any
@@ -103,10 +104,39 @@ class Command(click.RichCommand):
 
 
 class Group(click.RichGroup):
-    """click.Group subclass with custom ."""
+    """click.Group subclass with custom features.
+
+    Subcommands registered with ``add_lazy_command`` are only imported when
+    they're first looked up, so running one command doesn't pay for importing
+    the modules that implement unrelated commands.
+    """
 
     command_class = Command
 
+    lazy_commands: dict[str, str]
+    """Maps command names to the "module:attribute" path of their definition."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = {}
+
+    def add_lazy_command(self, name: str, import_path: str) -> None:
+        """Register a subcommand that is imported on first use.
+
+        ``import_path`` is of the form "module:attribute". Relative module names
+        are resolved relative to this package.
+        """
+        self.lazy_commands[name] = import_path
+
     def list_commands(self, context: click.Context) -> list[str]:
-        """List commands in declaration order."""
-        return list(self.commands)
+        """List commands in declaration order, followed by lazy commands."""
+        return list(dict.fromkeys([*self.commands, *self.lazy_commands]))
+
+    def get_command(self, context: click.Context, name: str) -> click.Command | None:
+        """Look up a command, importing a lazy command's module on first lookup."""
+        if name not in self.commands and name in self.lazy_commands:
+            module_name, attribute = self.lazy_commands[name].split(":")
+            command = getattr(import_module(module_name, __name__), attribute)
+            assert isinstance(command, click.Command)
+            self.add_command(command, name)
+        return super().get_command(context, name)
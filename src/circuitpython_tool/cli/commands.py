@@ -7,27 +7,21 @@ parts of the code being tied up with console output.
 
 """
 
-import asyncio
 import logging
-import shlex
-import subprocess
 from os import environ, execlp
 from pathlib import Path
-from shutil import rmtree, which
 from sys import argv, exit, stderr, stdout
 
 import rich_click as click
-from rich import get_console, print, traceback
-from rich.console import Console
-from rich.logging import RichHandler
+from rich import get_console, print
 from rich.prompt import Confirm
 from rich.rule import Rule
 from rich_click import argument, option
 
-from .. import VERSION, fs
-from ..async_iter import time_batched
+from .. import VERSION
+from ..defaults import COPY_JOBS
 from ..hw import Device, Query, devices_to_toml
-from . import Group, devices_table, uf2_commands
+from . import Group, devices_table
 from .decorators import pass_shared_state
 from .params import DeviceParam, FakeDeviceParam, QueryParam
 from .shared_state import SharedState
@@ -43,6 +37,9 @@ COMPLETE_VAR = "_CIRCUITPYTHON_TOOL_COMPLETE"
 
 def set_log_level(context: click.Context, param: click.Parameter, level: str) -> None:
     """Eager callback for --log-level flag."""
+    from rich.console import Console
+    from rich.logging import RichHandler
+
     logging.basicConfig(
         level=level,
         format="%(message)s",
@@ -90,13 +87,21 @@ def set_log_level(context: click.Context, param: click.Parameter, level: str) ->
 def main() -> None:
     """Tool for interfacing with CircuitPython devices."""
 
+    # The pretty traceback handler formats the local variables of every frame,
+    # which makes every uncaught exception slow to report, so it's only
+    # installed when debugging.
+    if not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+
     # Setup pretty traceback handler in a way that's relatively compact and
     # quiet, so that exceptions generally fit within a fraction of the terminal
     # window.
 
-    # Import modules without aliased names.
+    # Import modules without aliased names. rich.traceback is also imported
+    # here because it pulls in pygments, which is slow to import.
     import click
     import rich_click
+    from rich import traceback
 
     traceback.install(
         show_locals=True,
@@ -186,6 +191,8 @@ def devices(
 
 
 def get_source_dir(source_dir: Path | None) -> Path:
+    from .. import fs
+
     source_dir = source_dir or fs.guess_source_dir(Path.cwd())
     if source_dir is None:
         print(
@@ -229,12 +236,22 @@ def get_source_dir(source_dir: Path | None) -> Path:
     "This reduces spurious uploads when files update in quick succession. "
     "Unit: seconds",
 )
+@option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=COPY_JOBS,
+    show_default=True,
+    help="Maximum number of files to copy onto the device concurrently. "
+    "Not used when the upload is performed by ``rsync``.",
+)
 def upload(
     device: Device,
     source_dir: Path | None,
     circup: bool,
     mode: str,
     batch_period: float,
+    jobs: int,
 ) -> None:
     """
     Continuously upload code to device in response to source file changes.
@@ -249,6 +266,13 @@ def upload(
     paths and descendant paths of the source tree, and will re-upload code to
     the device on each event.
     """
+    # Only this command needs the filesystem watching and asyncio machinery, so
+    # other commands skip importing it.
+    import asyncio
+
+    from .. import fs
+    from ..async_iter import time_batched
+
     source_dir = get_source_dir(source_dir)
     if not fs.contains_main_code_file(source_dir) and not Confirm.ask(
         f"{source_dir} does not appear to contain any CircuitPython code."
@@ -260,32 +284,34 @@ def upload(
     print("Target device: ")
     print(device)
 
-    def sync() -> None:
+    def sync(modified_paths: set[Path] | None = None) -> None:
         mountpoint = device.mount_if_needed()
         with get_console().status("Uploading to device."):
-            fs.upload(source_dirs, mountpoint)
+            fs.upload(source_dirs, mountpoint, modified_paths, jobs)
         if circup:
             circup_sync(mountpoint)
 
-    # Always do at least one upload at the start.
-    sync()
-
     if mode == "single-shot":
+        sync()
         print("👍 Upload [green]complete[/].")
         exit()
 
+    # Start watching before the initial upload, so that modifications made
+    # while it's in progress are picked up by the first re-upload.
     events = time_batched(
         fs.watch_all(source_dirs), delay=lambda: asyncio.sleep(batch_period)
     )
+    sync()
 
     async def watch_loop() -> None:
         while True:
-            with get_console().status(
-                "[yellow]Waiting[/yellow] for file modification."
-            ):
-                modified_paths = await anext(events)
-                logger.info(f"Modified paths: {[str(p) for p in modified_paths]}")
-            sync()
+            # A one-off message rather than a spinner, which would keep
+            # redrawing the terminal for as long as the watch is idle.
+            print("[yellow]Waiting[/yellow] for file modification.")
+            # Editors often touch the same path several times per save.
+            modified_paths = set(await anext(events))
+            logger.info(f"Modified paths: {sorted(str(p) for p in modified_paths)}")
+            sync(modified_paths)
 
     try:
         asyncio.run(watch_loop())
@@ -304,6 +330,8 @@ def clean(device: Device) -> None:
         print("[yellow]Cancelling[/]")
         exit(1)
     mountpoint = device.mount_if_needed()
+    from shutil import rmtree
+
     with get_console().status("Deleting files."):
         for path in mountpoint.iterdir():
             if path == mountpoint / "boot_out.txt":
@@ -360,11 +388,15 @@ def unmount(device: Device) -> None:
     print("Device unmounted.")
 
 
-main.add_command(uf2_commands.uf2)
+main.add_lazy_command("uf2", ".uf2_commands:uf2")
 
 
 def circup_sync(mountpoint: Path) -> None:
     """Use 'circup' to install library dependencies onto device."""
+    import shlex
+    import subprocess
+    from shutil import which
+
     if not (circup := which("circup")):
         print(
             "🤷 [i]circup[/] command [red]not found[/]. "
@@ -6,10 +6,7 @@ from contextlib import contextmanager
 from importlib import resources
 from logging import getLogger
 from pathlib import Path
-from shutil import rmtree
 from sys import stdout
-from tempfile import mkdtemp
-from urllib.request import urlopen
 
 import rich_click as click
 from humanize import naturaldelta
@@ -102,6 +99,8 @@ def download(
         return destination
 
     logger.info("Populating cache from upstream.")
+    from urllib.request import urlopen
+
     response = urlopen(url)
     data = bytes()
     with progress.wrap_file(
@@ -416,6 +415,9 @@ def temporary_directory(delete: bool) -> Iterator[Path]:
 
     If `delete` is True, the directory is automatically deleted on exit.
     """
+    from shutil import rmtree
+    from tempfile import mkdtemp
+
     path = Path(mkdtemp())
     try:
         yield path
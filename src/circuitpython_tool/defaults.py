@@ -0,0 +1,12 @@
+"""Default settings shared between the CLI and library modules.
+
+Kept free of imports so that the CLI can use these without loading the
+modules they configure.
+"""
+
+COPY_JOBS = 4
+"""Default number of files copied concurrently.
+
+Kept small, as many concurrent writes to a FAT filesystem contend on its
+allocation table.
+"""
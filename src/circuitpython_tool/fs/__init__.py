@@ -4,6 +4,7 @@ from .fs import (
     upload,
     walk,
     walk_all,
+    walk_dirs,
     watch_all,
 )
 from .inotify import INotify
@@ -15,5 +16,6 @@ __all__ = [
     "upload",
     "walk",
     "walk_all",
+    "walk_dirs",
     "watch_all",
 ]
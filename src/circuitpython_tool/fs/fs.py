@@ -1,31 +1,67 @@
 """High-level filesystem operations."""
 
+import errno
+import filecmp
 import logging
+import os
 import re
 import shutil
+import stat
+import tempfile
 from collections.abc import AsyncIterator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 
+from ..defaults import COPY_JOBS
 from .inotify import INotify
 
 logger = logging.getLogger(__name__)
 
+FAT_MTIME_RESOLUTION_NS = 2_000_000_000
+"""Granularity of modification times on FAT filesystems."""
 
-def walk(root: Path) -> Iterator[Path]:
+
+def walk(root: Path, skip_hidden: bool = False) -> Iterator[Path]:
     """Recursively yields `root` and all descendant paths.
 
+    If `skip_hidden` is True, hidden files are skipped, and hidden directories
+    are not descended into.
+
     This is a replacement for Path.walk, which is only available in Python
-    3.12+.
+    3.12+. Directory entries are read with os.scandir, so telling files and
+    directories apart doesn't require a stat call per path.
     """
     yield root
-    for path in root.iterdir():
-        if path.is_dir():
-            try:
-                yield from walk(path)
-            except PermissionError as e:
-                logging.debug(f"Skipping {path}: {e}")
-        else:
-            yield path
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if skip_hidden and entry.name[0] == ".":
+                continue
+            path = Path(entry.path)
+            if entry.is_dir():
+                try:
+                    yield from walk(path, skip_hidden)
+                except PermissionError as e:
+                    logging.debug(f"Skipping {path}: {e}")
+            else:
+                yield path
+
+
+def walk_dirs(root: Path, skip_hidden: bool = False) -> Iterator[Path]:
+    """Recursively yields `root` and all descendant directories.
+
+    Like `walk`, but files are never turned into Path objects.
+    """
+    yield root
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if skip_hidden and entry.name[0] == ".":
+                continue
+            if entry.is_dir():
+                try:
+                    yield from walk_dirs(Path(entry.path), skip_hidden)
+                except PermissionError as e:
+                    logging.debug(f"Skipping {entry.path}: {e}")
 
 
 def walk_all(roots: Iterable[Path]) -> Iterator[tuple[Path, Path]]:
@@ -56,7 +92,9 @@ def guess_source_dir(start_dir: Path) -> Path | None:
 
     If no such file was found, None is returned.
     """
-    for path in walk(start_dir):
+    # Hidden directories (e.g. .git or .venv) can be large and never contain the
+    # user's code.
+    for path in walk(start_dir, skip_hidden=True):
         if contains_main_code_file(path):
             return path
     return None
@@ -79,19 +117,42 @@ def watch_all(roots: Iterable[Path]) -> AsyncIterator[Path]:
     # element of the coroutine.
     watcher = INotify()
     Mask = INotify.Mask
-    mask = Mask.CREATE | Mask.MODIFY | Mask.ATTRIB | Mask.DELETE | Mask.DELETE_SELF
-    for _, path in walk_all(roots):
-        if not path.is_dir():
-            continue
-        logger.info(f"Watching directory {path} for changes.")
-        watcher.add_watch(path, mask)
+    # Files are reported once they're closed after writing (or moved into place)
+    # rather than on every MODIFY, which editors can trigger many times per save.
+    mask = (
+        Mask.CREATE
+        | Mask.CLOSE_WRITE
+        | Mask.MOVED_TO
+        | Mask.MOVED_FROM
+        | Mask.ATTRIB
+        | Mask.DELETE
+        | Mask.DELETE_SELF
+    )
+    # Changes in hidden directories are never uploaded, so don't spend inotify
+    # watches on them.
+    for root in roots:
+        for path in walk_dirs(root, skip_hidden=True):
+            logger.info(f"Watching directory {path} for changes.")
+            watcher.add_watch(path, mask)
 
     async def gen() -> AsyncIterator[Path]:
         async for event in watcher.events():
             logging.debug(f"Filesystem event: {event}")
-            if Mask.CREATE in event.mask and event.path.is_dir():
-                logger.info(f"Watching newly created directory {path} for changes.")
-                watcher.add_watch(event.path, mask)
+            if Mask.ISDIR in event.mask:
+                if (
+                    Mask.CREATE in event.mask or Mask.MOVED_TO in event.mask
+                ) and event.path.name[0] != ".":
+                    # Subdirectories may already exist, e.g. when a package is
+                    # moved in, or with 'mkdir -p'.
+                    for path in walk_dirs(event.path, skip_hidden=True):
+                        logger.info(f"Watching new directory {path} for changes.")
+                        watcher.add_watch(path, mask)
+            elif Mask.CREATE in event.mask and is_regular_file(event.path):
+                # Newly created regular files are reported by a CLOSE_WRITE
+                # event once their contents have been written. Symlinks never
+                # get one, so they're reported here. Hard links created with
+                # 'ln' don't get one either, and are missed until modified.
+                continue
             # Note: We don't need to specially handle DELETE events on
             # directories; deleted directories are automatically removed from
             # the watch via the IN_IGNORED mask:
@@ -101,43 +162,239 @@ def watch_all(roots: Iterable[Path]) -> AsyncIterator[Path]:
     return gen()
 
 
-def upload(source_dirs: Iterable[Path], mountpoint: Path) -> None:
-    """Copy all source files onto the device."""
-
-    def copy_file(source: Path | str, dest: Path | str) -> None:
-        """Copy file `source` to `dest`.
-
-        Skips hidden files and files with same timestamps under FAT timestamp rounding.
-        """
-        if isinstance(source, str):
-            source = Path(source)
-        if isinstance(dest, str):
-            dest = Path(dest)
-        if source.name[0] == "." or source.is_dir():
-            logger.debug(f"Skipping {source}")
-            return
-        if dest.exists():
-            # Round source timestamp to 2s resolution to match FAT drive.
-            # This prevents spurious timestamp mismatches.
-            source_mtime = (source.stat().st_mtime // 2) * 2
-            dest_mtime = dest.stat().st_mtime
-            if source_mtime == dest_mtime:
-                logger.debug(
-                    f"Skipping {source} because destination file has same modification time."
-                )
-                return
-        logger.info(f"Copying {source}")
-        shutil.copy2(source, dest)
-
-    for source_dir in source_dirs:
-        for source in source_dir.iterdir():
-            rel_path = source.relative_to(source_dir)
-            dest = mountpoint / rel_path
-            if source.is_dir():
-                shutil.copytree(
-                    source, dest, copy_function=copy_file, dirs_exist_ok=True
-                )
-                continue
-            copy_file(source, dest)
+def is_regular_file(path: Path) -> bool:
+    """Returns True if `path` is a regular file, without following symlinks."""
+    try:
+        return stat.S_ISREG(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
 
+
+def upload(
+    source_dirs: Iterable[Path],
+    mountpoint: Path,
+    paths: Iterable[Path] | None = None,
+    jobs: int = COPY_JOBS,
+) -> None:
+    """Copy source files onto the device.
+
+    If `paths` is specified, only those paths (and their descendants, for
+    directories) are copied. This lets callers that already know which files
+    changed avoid rescanning the entire source tree.
+
+    Otherwise all source files are copied. If available, `rsync` is used to
+    perform the whole upload in a single process; if not, up to `jobs` files are
+    copied concurrently.
+
+    The `rsync` upload skips the same unchanged files, but differs from the
+    copy-based upload in a few ways: `jobs` is ignored, files whose timestamps
+    differ are rewritten even if their contents are identical, files are
+    overwritten in place, and no copy summary is logged.
+    """
+    if paths is not None:
+        copy_paths(source_dirs, mountpoint, paths, jobs)
+    elif rsync := shutil.which("rsync"):
+        rsync_upload(rsync, source_dirs, mountpoint)
+    else:
+        copy_upload(source_dirs, mountpoint, jobs)
     logger.info("Upload complete")
+
+
+def rsync_upload(rsync: str, source_dirs: Iterable[Path], mountpoint: Path) -> None:
+    """Copy all source files onto the device using `rsync`."""
+    import subprocess
+
+    args = [
+        rsync,
+        "--recursive",
+        "--times",
+        # FAT can't store symlinks, so upload the files they point to, like the
+        # copy-based upload does.
+        "--copy-links",
+        # FAT timestamps have 2 second resolution. This is the value rsync's
+        # manpage recommends for FAT.
+        "--modify-window=1",
+        # Small CIRCUITPY drives often can't hold a temporary copy of a file
+        # alongside the original.
+        "--inplace",
+        # Skip hidden files.
+        "--exclude=.*",
+        # Trailing slashes copy directory contents rather than the directory itself.
+        *(f"{d}/" for d in source_dirs),
+        f"{mountpoint}/",
+    ]
+    logger.debug(f"Executing command: {args}")
+    subprocess.run(args, check=True)
+
+
+def copy_upload(source_dirs: Iterable[Path], mountpoint: Path, jobs: int) -> None:
+    """Copy all source files onto the device without `rsync`."""
+    copies = (
+        copy
+        for source_dir in source_dirs
+        for copy in tree_copies(source_dir, mountpoint)
+    )
+    copy_files(copies, jobs)
+
+
+def copy_paths(
+    source_dirs: Iterable[Path], mountpoint: Path, paths: Iterable[Path], jobs: int
+) -> None:
+    """Copy specific descendants of the source directories onto the device."""
+    copy_files(path_copies(source_dirs, mountpoint, paths), jobs)
+
+
+@dataclass(frozen=True, slots=True)
+class FileCopy:
+    """A file that may need to be copied onto the device."""
+
+    source: Path
+    source_stat: os.stat_result
+
+    dest: Path
+    dest_stat: os.stat_result | None
+    """Status of `dest`, or None if it doesn't exist."""
+
+
+def copy_files(copies: Iterable[FileCopy], jobs: int = COPY_JOBS) -> None:
+    """Perform the given file copies, up to `jobs` at a time.
+
+    Writes to USB mass storage are latency bound, so overlapping them speeds up
+    uploads of many small files.
+
+    Individual files are only logged at DEBUG level; a summary is logged at INFO
+    level. Logging every file can take longer than copying it.
+    """
+    with ThreadPoolExecutor(jobs) as executor:
+        # Consuming the results also propagates any exceptions.
+        results = list(executor.map(copy_file, copies))
+    logger.info(f"Copied {sum(results)} of {len(results)} files.")
+
+
+def path_copies(
+    source_dirs: Iterable[Path], mountpoint: Path, paths: Iterable[Path]
+) -> Iterator[FileCopy]:
+    """Files to copy for specific descendants of the source directories.
+
+    Destination directories are created as needed.
+    """
+    # Check deeper source directories first, in case they're nested.
+    source_dirs = sorted(source_dirs, key=lambda d: len(d.parts), reverse=True)
+    # Destination directories known to exist, so that copying many files into
+    # the same directory only creates it once.
+    dest_dirs: set[Path] = set()
+    paths = set(paths)
+    for path in paths:
+        if any(parent in paths for parent in path.parents):
+            # Already covered by copying the whole ancestor directory.
+            continue
+        source_dir = next((d for d in source_dirs if path.is_relative_to(d)), None)
+        if source_dir is None:
+            logger.debug(f"Skipping {path} outside of source directories.")
+            continue
+        rel_path = path.relative_to(source_dir)
+        if any(part[0] == "." for part in rel_path.parts):
+            logger.debug(f"Skipping hidden path {path}")
+            continue
+        if not path.exists():
+            # Deletions are not propagated to the device.
+            logger.debug(f"Skipping deleted path {path}")
+            continue
+        dest = mountpoint / rel_path
+        if path.is_dir():
+            yield from tree_copies(path, dest)
+            continue
+        if dest.parent not in dest_dirs:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest_dirs.add(dest.parent)
+            dest_dirs.update(dest.parent.parents)
+        try:
+            dest_stat: os.stat_result | None = dest.stat()
+        except FileNotFoundError:
+            dest_stat = None
+        yield FileCopy(path, path.stat(), dest, dest_stat)
+
+
+def tree_copies(source: Path, dest: Path) -> Iterator[FileCopy]:
+    """Files to copy when copying the contents of directory `source` into `dest`.
+
+    Hidden files and directories are skipped. Destination directories are
+    created as they're visited.
+
+    Uses os.scandir so that file types and stat results are reused from the
+    directory scan instead of being queried again for each file. The
+    destination directory is scanned once up front as well, so files that don't
+    exist on the device yet cost no extra syscalls.
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    with os.scandir(dest) as entries:
+        dest_entries = {entry.name: entry for entry in entries}
+    with os.scandir(source) as entries:
+        for entry in entries:
+            if entry.name[0] == ".":
+                logger.debug(f"Skipping hidden path {entry.path}")
+                continue
+            if entry.is_dir():
+                yield from tree_copies(Path(entry.path), dest / entry.name)
+                continue
+            dest_entry = dest_entries.get(entry.name)
+            dest_stat = None if dest_entry is None else dest_entry.stat()
+            yield FileCopy(Path(entry.path), entry.stat(), dest / entry.name, dest_stat)
+
+
+def copy_file(copy: FileCopy) -> bool:
+    """Perform a single file copy, returning whether any data was copied.
+
+    Skips files with same timestamps under FAT timestamp rounding.
+
+    Files whose timestamps differ but whose contents are identical (e.g. after a
+    git checkout) only have their timestamp updated. This transfers less data
+    over USB and wears the device's flash less than rewriting the contents.
+    """
+    source = copy.source
+    source_stat = copy.source_stat
+    dest_stat = copy.dest_stat
+    times_ns = (source_stat.st_atime_ns, source_stat.st_mtime_ns)
+    if dest_stat is not None:
+        # Round both timestamps to FAT resolution to prevent spurious
+        # mismatches. Integer nanoseconds avoid floating point rounding error.
+        source_mtime = source_stat.st_mtime_ns // FAT_MTIME_RESOLUTION_NS
+        dest_mtime = dest_stat.st_mtime_ns // FAT_MTIME_RESOLUTION_NS
+        if source_mtime == dest_mtime:
+            logger.debug(
+                f"Skipping {source} because destination file has same modification time."
+            )
+            return False
+        if source_stat.st_size == dest_stat.st_size and filecmp.cmp(
+            source, copy.dest, shallow=False
+        ):
+            logger.debug(
+                f"Updating timestamp of {copy.dest}, which has the same contents as {source}."
+            )
+            os.utime(copy.dest, ns=times_ns)
+            return False
+    logger.debug(f"Copying {source}")
+    # Write to a hidden file in the same directory and rename it into place, so
+    # that an interrupted copy never leaves a truncated file behind (like rsync
+    # does). The name is unique so that concurrent copies can't collide.
+    fd, temp_name = tempfile.mkstemp(dir=copy.dest.parent, prefix=f".{copy.dest.name}.")
+    os.close(fd)
+    temp = Path(temp_name)
+    try:
+        # Unlike shutil.copy2, this skips re-stat'ing the source and copying
+        # permission bits and extended attributes, which FAT doesn't support.
+        shutil.copyfile(source, temp)
+        os.utime(temp, ns=times_ns)
+        os.replace(temp, copy.dest)
+    except OSError as e:
+        temp.unlink(missing_ok=True)
+        if e.errno != errno.ENOSPC:
+            raise
+        # Small CIRCUITPY drives often can't hold the old and new file at once.
+        logger.debug(f"No space for temporary copy of {source}; overwriting in place.")
+        shutil.copyfile(source, copy.dest)
+        os.utime(copy.dest, ns=times_ns)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+    return True
@@ -7,7 +7,7 @@ from pathlib import Path
 from ..render import TableFields, pretty_datetime, rich_renderable_as_table
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BootInfo:
     version: str
     """Version of CircuitPython running on the board."""
@@ -17,7 +17,7 @@ class BootInfo:
 
 
 @rich_renderable_as_table
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Device:
     """A CircuitPython composite USB device."""
 
@@ -1,16 +1,18 @@
 """Fake Device implementation for testing and demos."""
 
-from collections.abc import Iterable
+import sys
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from pathlib import Path
-
-import tomlkit
-from tomlkit.items import Table
+from typing import TYPE_CHECKING, Any
 
 from .device import Device
 
+if TYPE_CHECKING:
+    from tomlkit.items import Table
+
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FakeDevice(Device):
     """Fake Device implementation for use in tests and demos."""
 
@@ -29,13 +31,23 @@ class FakeDevice(Device):
         """Load FakeDevice objects from a TOML file."""
         if isinstance(toml, Path):
             toml = toml.read_text()
-        document = tomlkit.loads(toml)
-        tables = document.get("devices", tomlkit.aot())
+        # The file is only read here, so the faster standard library parser is
+        # used when available. tomlkit is only needed to preserve formatting
+        # when writing.
+        if sys.version_info >= (3, 11):
+            import tomllib
+
+            document = tomllib.loads(toml)
+        else:
+            import tomlkit
+
+            document = tomlkit.loads(toml)
+        tables = document.get("devices", [])
         assert isinstance(tables, list)
         return {FakeDevice.from_toml(t) for t in tables}
 
     @staticmethod
-    def from_toml(table: Table) -> "FakeDevice":
+    def from_toml(table: Mapping[str, Any]) -> "FakeDevice":
         def get(key: str) -> str:
             value = table[key]
             assert isinstance(value, str)
@@ -56,7 +68,9 @@ class FakeDevice(Device):
             mountpoint=get_optional_path("mountpoint"),
         )
 
-    def to_toml(self) -> Table:
+    def to_toml(self) -> "Table":
+        import tomlkit
+
         table = tomlkit.table()
         table["vendor"] = self.vendor
         table["model"] = self.model
@@ -72,6 +86,8 @@ class FakeDevice(Device):
 
 def devices_to_toml(devices: Iterable[Device]) -> str:
     """Save arbitrary Device objects to a TOML file."""
+    import tomlkit
+
     doc = tomlkit.document()
     devices_array = tomlkit.aot()
     for d in sorted(devices, key=lambda d: d.key):
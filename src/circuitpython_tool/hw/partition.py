@@ -1,5 +1,8 @@
 """Library for interacting with partition devices (e.g. /dev/sda1)."""
 
+import os
+import re
+import stat
 from collections.abc import Iterator
 from contextlib import contextmanager
 from logging import getLogger
@@ -12,6 +15,12 @@ logger = getLogger(__name__)
 PARTITION_DIR = Path("/dev/disk/by-id")
 """Contains all partition devices on the system."""
 
+MOUNTINFO_PATH = Path("/proc/self/mountinfo")
+"""Table of mounted filesystems.
+
+Format documented at https://man7.org/linux/man-pages/man5/proc.5.html
+"""
+
 
 def mountpoint(partition_path: Path) -> Path | None:
     """Find the mountpoint of the given partition device.
@@ -19,11 +28,42 @@ def mountpoint(partition_path: Path) -> Path | None:
     Returns None if the device is not mounted."""
     if not partition_path:
         return None
-    command = f"lsblk {partition_path} --output mountpoint --noheadings"
-    out = run(command).strip()
-    if not out:
+    device = os.path.realpath(partition_path)
+    number = device_number(device)
+    for line in MOUNTINFO_PATH.read_text().splitlines():
+        fields = line.split(" ")
+        if number:
+            # The device number identifies the mount even when the mount
+            # source is reported under a different name.
+            if fields[2] != number:
+                continue
+        else:
+            # The variable-length list of optional fields starting at index 6
+            # is terminated by a single hyphen. The mount source follows the
+            # filesystem type after that.
+            separator = fields.index("-", 6)
+            if unescape(fields[separator + 2]) != device:
+                continue
+        return Path(unescape(fields[4]))
+    return None
+
+
+def device_number(device: str) -> str | None:
+    """The "major:minor" device number of a block device, as used in mountinfo.
+
+    Returns None if the path is not a block device."""
+    try:
+        st = os.stat(device)
+    except OSError:
+        return None
+    if not stat.S_ISBLK(st.st_mode):
         return None
-    return Path(out)
+    return f"{os.major(st.st_rdev)}:{os.minor(st.st_rdev)}"
+
+
+def unescape(field: str) -> str:
+    """Decode octal escapes (e.g. "\\040" for space) in a mountinfo field."""
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m[1], 8)), field)
 
 
 def mount_if_needed(partition_path: Path) -> Path:
@@ -31,6 +71,11 @@ def mount_if_needed(partition_path: Path) -> Path:
     existing_mountpoint = mountpoint(partition_path)
     if existing_mountpoint:
         return existing_mountpoint
+    return mount(partition_path)
+
+
+def mount(partition_path: Path) -> Path:
+    """Mount the given (currently unmounted) device and return the mountpoint."""
     command = f"udisksctl mount --block-device {partition_path} --options noatime"
     mount_stdout = run(command).strip()
     logger.info(f"udisksctl: {mount_stdout}")
@@ -64,6 +109,6 @@ def temporarily_mount(partition_path: Path) -> Iterator[Path]:
         return
 
     try:
-        yield mount_if_needed(partition_path)
+        yield mount(partition_path)
     finally:
         unmount_if_needed(partition_path)
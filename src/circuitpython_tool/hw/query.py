@@ -37,12 +37,11 @@ class Query:
 
     def matches(self, device: Device) -> bool:
         """Whether this device is matched by the query."""
-        return all(
-            (
-                self.vendor in device.vendor,
-                self.model in device.model,
-                self.serial in device.serial,
-            )
+        # Serial numbers are the most selective field, so check them first.
+        return (
+            self.serial in device.serial
+            and self.vendor in device.vendor
+            and self.model in device.model
         )
 
     def matching_devices(self, devices: Iterable[Device]) -> list[Device]:
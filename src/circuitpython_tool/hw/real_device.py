@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 
 
 class RealDevice(Device):
+    # Keep instances free of a per-instance __dict__, like the Device base class.
+    __slots__ = ()
+
     def get_mountpoint(self) -> Path | None:
         return partition.mountpoint(self.partition_path)
 
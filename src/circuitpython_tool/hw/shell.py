@@ -1,14 +1,17 @@
 """Library for running simple external binaries."""
 
 import logging
-import shlex
-import subprocess
 
 logger = logging.getLogger(__name__)
 
 
 def run(command: str) -> str:
     """Execute command and return its stdout output."""
+    # Deferred so that commands which never spawn a process don't pay for
+    # these imports.
+    import shlex
+    import subprocess
+
     logging.debug(f"Executing command: {command}")
     process = subprocess.run(shlex.split(command), capture_output=True, text=True)
     try:
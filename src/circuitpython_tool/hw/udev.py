@@ -1,10 +1,31 @@
+import time
 from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from ..iter import as_list
 from .shell import run
 
+UDEV_DATA_DIR = Path("/run/udev/data")
+"""udev database directory, containing one file of properties per device."""
+
+SYSFS_DEV_DIR = Path("/sys/dev")
+"""sysfs directory of device nodes, indexed by device type and number."""
+
+DEVICE_TYPES = {"b": "block", "c": "char"}
+"""Maps udev database file name prefixes to sysfs device types."""
+
+USB_BUS_PROPERTY = "ID_BUS=usb"
+"""Substring present in the properties of every USB device."""
+
+RACY_WINDOW_NS = 1_000_000_000
+"""Database modifications more recent than this are not trusted for caching.
+
+Directory timestamps have coarse granularity, so a change made shortly after a
+scan might not change the timestamp.
+"""
+
 
 def udevadm_export_db() -> str:
     """Dump information on all attached devices.
@@ -17,7 +38,7 @@ def udevadm_export_db() -> str:
     return run("udevadm info --export-db")
 
 
-@dataclass
+@dataclass(slots=True)
 class UsbDevice:
     """USB device properties from udev."""
 
@@ -41,16 +62,28 @@ class UsbDevice:
     is_tty: bool = False
     """True if this is a serial terminal."""
 
+    @staticmethod
+    def all() -> list["UsbDevice"]:
+        """List of all attached USB devices.
+
+        Results are reused until the udev database is modified.
+        """
+        try:
+            modification_time = UDEV_DATA_DIR.stat().st_mtime_ns
+        except FileNotFoundError:
+            # We can't detect changes without the database directory.
+            return UsbDevice.scan()
+        if time.time_ns() - modification_time < RACY_WINDOW_NS:
+            return UsbDevice.scan()
+        return list(cached_scan(UDEV_DATA_DIR, modification_time))
+
     @as_list
     @staticmethod
-    def all() -> Iterator["UsbDevice"]:
-        """List of all attached USB devices."""
-        # Entries have one blank line between them.
-        for entry in udevadm_export_db().rstrip().split("\n\n"):
-            properties = parse_properties(entry)
-            if properties.get("ID_BUS") != "usb":
-                continue
-            # DEVPATH names don't work with 'lsblk', so we use DEVNAME
+    def scan() -> Iterator["UsbDevice"]:
+        """Uncached version of UsbDevice.all()."""
+        for properties in usb_device_properties():
+            # DEVPATH is a sysfs path; mounting and mountpoint lookups need the
+            # device node path (e.g. /dev/sda1) in DEVNAME.
             if not (devname := properties.get("DEVNAME")):
                 continue
             yield UsbDevice(
@@ -67,14 +100,75 @@ class UsbDevice:
             )
 
 
+@lru_cache(maxsize=1)
+def cached_scan(data_dir: Path, modification_time: int) -> tuple[UsbDevice, ...]:
+    """Memoized UsbDevice.scan(), keyed by the udev database's state."""
+    return tuple(UsbDevice.scan())
+
+
+def usb_device_properties() -> Iterator[dict[str, str]]:
+    """Properties of each USB device known to udev.
+
+    If available, the udev database files are read directly. This is much
+    faster than spawning `udevadm`, which we fall back to otherwise.
+    """
+    if not UDEV_DATA_DIR.is_dir():
+        # Entries have one blank line between them.
+        for entry in udevadm_export_db().rstrip().split("\n\n"):
+            # Cheap pre-filter to avoid parsing most non-USB entries.
+            if USB_BUS_PROPERTY not in entry:
+                continue
+            properties = parse_properties(entry)
+            if properties.get("ID_BUS") == "usb":
+                yield properties
+        return
+    for data_path in UDEV_DATA_DIR.iterdir():
+        try:
+            device_properties = read_device_data(data_path)
+        except FileNotFoundError:
+            # Device was removed while we were scanning.
+            continue
+        if device_properties is not None:
+            yield device_properties
+
+
+def read_device_data(data_path: Path) -> dict[str, str] | None:
+    """Parse device properties from a udev database file.
+
+    Database files are named after the device type and number (e.g. "b8:1" for
+    block device 8:1). Returns None for files that don't describe a USB device
+    node.
+
+    Properties that come from the kernel rather than udev (DEVNAME and
+    SUBSYSTEM) are not in the database file, so we look them up in sysfs.
+    """
+    device_type = DEVICE_TYPES.get(data_path.name[0])
+    if not device_type:
+        return None
+    data = data_path.read_text()
+    # Skip non-USB devices before doing any further parsing or sysfs lookups.
+    if USB_BUS_PROPERTY not in data:
+        return None
+    properties = parse_properties(data)
+    if properties.get("ID_BUS") != "usb":
+        return None
+    sysfs_path = SYSFS_DEV_DIR / device_type / data_path.name[1:]
+    for line in (sysfs_path / "uevent").read_text().splitlines():
+        key, _, value = line.partition("=")
+        if key == "DEVNAME":
+            properties["DEVNAME"] = f"/dev/{value}"
+    properties["SUBSYSTEM"] = (sysfs_path / "subsystem").resolve().name
+    return properties
+
+
 def parse_properties(entry: str) -> dict[str, str]:
     """Parse device properties from a udev database entry."""
     properties: dict[str, str] = {}
-    for original_line in entry.splitlines():
-        # Only pay attention to device property lines (prefix "E:")
-        line = original_line.removeprefix("E: ")
-        if line == original_line:
+    for line in entry.splitlines():
+        # Only pay attention to device property lines (prefix "E:"). `udevadm`
+        # output has a space after the prefix, but the database files do not.
+        if not line.startswith("E:"):
             continue
-        key, value = line.split("=", maxsplit=1)
+        key, _, value = line[2:].lstrip(" ").partition("=")
         properties[key] = value
     return properties
@@ -8,7 +8,7 @@ from .udev import UsbDevice
 
 
 @rich_renderable_as_table
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Uf2Device:
     """A device in UF2 bootloader mode."""
 
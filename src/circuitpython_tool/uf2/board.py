@@ -3,11 +3,10 @@
 import logging
 from collections.abc import Iterator
 from dataclasses import dataclass
+from functools import lru_cache
 from json import loads
-from urllib.request import urlopen
 
 from ..iter import as_list
-from ..request_cache import RequestCache
 
 logger = logging.getLogger(__name__)
 
@@ -52,11 +51,15 @@ class Board:
     def most_recent_version(self) -> Version:
         return self.versions[-1]
 
-    @as_list
     @staticmethod
-    def all() -> Iterator["Board"]:
+    def all() -> list["Board"]:
         """All available boards, sorted by decreasing popularity."""
-        for board_json in loads(Board.cached_boards_json()):
+        return list(parse_boards(Board.cached_boards_json()))
+
+    @staticmethod
+    def parse(boards_json: str) -> Iterator["Board"]:
+        """Parse boards from circuitpython.org's boards JSON."""
+        for board_json in loads(boards_json):
             board = Board(board_json["id"])
             for version_json in board_json["versions"]:
                 if "uf2" not in version_json["extensions"]:
@@ -105,15 +108,37 @@ class Board:
 
         The data is fetched from circuitpython.org's github repo and cached to disk.
         """
+        # The cache directory is located with platformdirs, which is only worth
+        # importing when board data is actually needed.
+        from ..request_cache import RequestCache
+
         url = "https://raw.githubusercontent.com/adafruit/circuitpython-org/main/_data/files.json"
         cache = RequestCache()
-        if url in cache:
+        try:
+            data = cache[url]
+        except KeyError:
+            pass
+        else:
             logging.debug("Using cached data for CircuitPython boards JSON.")
-            return str(cache[url], encoding="utf-8")
+            return str(data, encoding="utf-8")
         logging.debug(
             f"CircuitPython boards JSON not found in cached; populating from {url}"
         )
+        # urllib.request transitively imports ssl, which is slow to load.
+        from urllib.request import urlopen
+
         with urlopen(url) as request:
             data = request.read()
         cache[url] = data
         return str(data, encoding="utf-8")
+
+
+@lru_cache(maxsize=1)
+def parse_boards(boards_json: str) -> tuple[Board, ...]:
+    """Memoized Board.parse().
+
+    A single command often looks up boards several times (e.g. to validate
+    a board ID and then a locale), and the JSON is large enough that parsing it
+    dominates each lookup.
+    """
+    return tuple(Board.parse(boards_json))
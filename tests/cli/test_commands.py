@@ -5,6 +5,7 @@ from typing import Any, Iterator, TypeAlias
 
 import pytest
 import rich
+import rich_click as click
 
 from circuitpython_tool.cli import commands
 from circuitpython_tool.hw import FakeDevice, devices_to_toml
@@ -61,7 +62,8 @@ def exits_with_code(code: int) -> Iterator[None]:
 
 
 def test_subcommands() -> None:
-    assert set(commands.main.commands.keys()) == {
+    context = click.Context(commands.main)
+    assert set(commands.main.list_commands(context)) == {
         "clean",
         "completion",
         "connect",
@@ -73,6 +75,14 @@ def test_subcommands() -> None:
     }
 
 
+def test_lazy_subcommand() -> None:
+    """Lazily registered commands are imported when looked up."""
+    context = click.Context(commands.main)
+    uf2 = commands.main.get_command(context, "uf2")
+    assert isinstance(uf2, click.Group)
+    assert "download" in uf2.list_commands(context)
+
+
 def test_device_list_no_devices(capsys: CaptureFixture, cli: CliRunner) -> None:
     with exits_with_code(0):
         cli.run("devices")
@@ -1,7 +1,25 @@
 import asyncio
+import errno
+import logging
+import os
+import shutil
+import subprocess
+import threading
 from pathlib import Path
+from typing import Any
 
-from circuitpython_tool.fs import guess_source_dir, upload, walk, watch_all
+from pytest import (
+    FixtureRequest,
+    LogCaptureFixture,
+    MonkeyPatch,
+    fixture,
+    mark,
+    raises,
+    skip,
+)
+
+from circuitpython_tool.fs import guess_source_dir, upload, walk, walk_dirs, watch_all
+from circuitpython_tool.fs.fs import FileCopy, copy_files
 
 
 def test_guess_source_dir_empty_dir(tmp_path: Path) -> None:
@@ -75,6 +93,36 @@ def test_walk(tmp_path: Path) -> None:
     )
 
 
+def test_walk_skip_hidden(tmp_path: Path) -> None:
+    for p in ("file.txt", ".hidden.txt", "a/file.txt", ".git/config"):
+        create_file(tmp_path, p)
+
+    entries = [str(p.relative_to(tmp_path)) for p in walk(tmp_path, skip_hidden=True)]
+
+    assert sorted(entries) == [".", "a", "a/file.txt", "file.txt"]
+
+
+def test_walk_dirs(tmp_path: Path) -> None:
+    for p in ("file.txt", "a/file.txt", "a/b/file.txt", "c/file.txt", ".git/config"):
+        create_file(tmp_path, p)
+
+    entries = [
+        str(p.relative_to(tmp_path)) for p in walk_dirs(tmp_path, skip_hidden=True)
+    ]
+
+    assert sorted(entries) == [".", "a", "a/b", "c"]
+
+
+@fixture(params=["copy", "rsync"])
+def upload_method(request: FixtureRequest, monkeypatch: MonkeyPatch) -> None:
+    """Run test with both rsync-based and copy-based uploads."""
+    if request.param == "copy":
+        monkeypatch.setattr(shutil, "which", lambda name: None)
+    elif not shutil.which("rsync"):
+        skip("rsync not installed")
+
+
+@mark.usefixtures("upload_method")
 def test_upload_single_dir(tmp_path: Path) -> None:
     source_dir = tmp_path / "source_dir"
     source_dir.mkdir()
@@ -96,6 +144,7 @@ def test_upload_single_dir(tmp_path: Path) -> None:
     )
 
 
+@mark.usefixtures("upload_method")
 def test_upload_multiple_dirs(tmp_path: Path) -> None:
     source_dir_a = tmp_path / "source_a"
     source_dir_a.mkdir()
@@ -121,6 +170,7 @@ def test_upload_multiple_dirs(tmp_path: Path) -> None:
     )
 
 
+@mark.usefixtures("upload_method")
 def test_upload_existing_dir(tmp_path: Path) -> None:
     """Existing directories should be allowed; already existing file error should not occur."""
     source_dir = tmp_path / "source"
@@ -139,6 +189,281 @@ def test_upload_existing_dir(tmp_path: Path) -> None:
     assert entries == [".", "sub"]
 
 
+@mark.usefixtures("upload_method")
+def test_upload_skips_hidden_paths(tmp_path: Path) -> None:
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+
+    create_file(source_dir, "code.py")
+    create_file(source_dir, ".hidden.txt")
+    create_file(source_dir, ".git/config")
+
+    upload([source_dir], mountpoint)
+
+    entries = [str(p.relative_to(mountpoint)) for p in walk(mountpoint)]
+    assert sorted(entries) == [".", "code.py"]
+
+
+def test_upload_paths(tmp_path: Path) -> None:
+    """Only the requested paths should be copied."""
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+
+    create_file(source_dir, "modified.txt")
+    create_file(source_dir, "unmodified.txt")
+    create_file(source_dir, "new_dir/file.txt")
+    create_file(source_dir, ".hidden/file.txt")
+
+    upload(
+        [source_dir],
+        mountpoint,
+        paths=[
+            source_dir / "modified.txt",
+            source_dir / "new_dir",
+            source_dir / ".hidden" / "file.txt",
+            source_dir / "deleted.txt",
+            tmp_path / "outside.txt",
+        ],
+    )
+
+    entries = [str(p.relative_to(mountpoint)) for p in walk(mountpoint) if p.is_file()]
+    assert sorted(entries) == ["modified.txt", "new_dir/file.txt"]
+
+
+def test_upload_paths_with_ancestor_directory(
+    tmp_path: Path, caplog: LogCaptureFixture
+) -> None:
+    """Files within a modified directory should only be copied once."""
+    source_dir = tmp_path / "source"
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+    (source_dir / "lib").mkdir(parents=True)
+    create_file(source_dir, "lib/a.py")
+
+    with caplog.at_level(logging.INFO):
+        upload(
+            [source_dir],
+            mountpoint,
+            paths=[source_dir / "lib", source_dir / "lib" / "a.py"],
+        )
+    assert "Copied 1 of 1 files." in caplog.messages
+    assert (mountpoint / "lib" / "a.py").exists()
+
+
+def test_upload_paths_creates_directories_once(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """Copying many files into one directory should only create it once."""
+    source_dir = tmp_path / "source"
+    mountpoint = tmp_path / "mountpoint"
+    (mountpoint / "a").mkdir(parents=True)
+    (source_dir / "a" / "b").mkdir(parents=True)
+    paths = [source_dir / "a" / "b" / f"{i}.txt" for i in range(5)]
+    for path in paths:
+        path.touch()
+
+    created: list[Path] = []
+    mkdir = Path.mkdir
+
+    def counting_mkdir(self: Path, *args: Any, **kwargs: Any) -> None:
+        created.append(self)
+        mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+    upload([source_dir], mountpoint, paths=paths)
+
+    assert created == [mountpoint / "a" / "b"]
+    assert sorted(p.name for p in (mountpoint / "a" / "b").iterdir()) == [
+        f"{i}.txt" for i in range(5)
+    ]
+
+
+@mark.usefixtures("upload_method")
+def test_upload_skips_unchanged_files(tmp_path: Path) -> None:
+    """Files whose timestamps match under FAT rounding should not be rewritten."""
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+
+    source = source_dir / "code.py"
+    source.write_text("new contents")
+    dest = mountpoint / "code.py"
+    dest.write_text("old contents")
+    # Timestamps differ, but fall within the same 2 second FAT interval.
+    os.utime(source, ns=(0, 1_000_000_000_000_000_001))
+    os.utime(dest, ns=(0, 1_000_000_000_000_000_000))
+
+    upload([source_dir], mountpoint)
+    assert dest.read_text() == "old contents"
+
+    os.utime(source, ns=(0, 1_000_000_010_000_000_000))
+    upload([source_dir], mountpoint)
+    assert dest.read_text() == "new contents"
+
+
+def test_upload_touches_identical_files(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """Files with different timestamps but the same contents should not be rewritten."""
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+
+    source = source_dir / "code.py"
+    source.write_text("contents")
+    dest = mountpoint / "code.py"
+    dest.write_text("contents")
+    os.utime(source, ns=(0, 1_000_000_010_000_000_000))
+    os.utime(dest, ns=(0, 1_000_000_000_000_000_000))
+
+    def fail_copy(*args: Any) -> None:
+        raise AssertionError("File should not have been copied.")
+
+    monkeypatch.setattr(shutil, "copyfile", fail_copy)
+    upload([source_dir], mountpoint)
+    assert dest.stat().st_mtime_ns == source.stat().st_mtime_ns
+
+
+def test_upload_interrupted_copy(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """A failed copy should leave the previous destination file intact."""
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+    (source_dir / "code.py").write_text("new contents")
+    dest = mountpoint / "code.py"
+    dest.write_text("old")
+    os.utime(dest, ns=(0, 0))
+
+    def interrupted_copy(source: Path, dest: Path) -> None:
+        dest.write_text("new")
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(shutil, "copyfile", interrupted_copy)
+    with raises(KeyboardInterrupt):
+        upload([source_dir], mountpoint)
+    assert [p.name for p in mountpoint.iterdir()] == ["code.py"]
+    assert dest.read_text() == "old"
+
+
+def test_upload_no_space_for_temporary_copy(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """Files should be overwritten in place if the temporary copy doesn't fit."""
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+    (source_dir / "code.py").write_text("new contents")
+    dest = mountpoint / "code.py"
+    dest.write_text("old")
+    os.utime(dest, ns=(0, 0))
+
+    copyfile = shutil.copyfile
+
+    def full_disk_copy(source: Path, dest: Path) -> None:
+        if dest.name.startswith("."):
+            dest.write_text("new")
+            raise OSError(errno.ENOSPC, "No space left on device")
+        copyfile(source, dest)
+
+    monkeypatch.setattr(shutil, "copyfile", full_disk_copy)
+    upload([source_dir], mountpoint)
+    assert [p.name for p in mountpoint.iterdir()] == ["code.py"]
+    assert dest.read_text() == "new contents"
+
+
+def test_concurrent_copies_of_same_file(
+    tmp_path: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """Concurrent copies to the same destination shouldn't share a temporary file."""
+    source = tmp_path / "code.py"
+    source.write_text("contents")
+    dest = tmp_path / "mountpoint" / "code.py"
+    dest.parent.mkdir()
+
+    # Make both copies finish writing before either is renamed into place.
+    barrier = threading.Barrier(2, timeout=5)
+    copyfile = shutil.copyfile
+
+    def concurrent_copy(source: Path, dest: Path) -> None:
+        copyfile(source, dest)
+        barrier.wait()
+
+    monkeypatch.setattr(shutil, "copyfile", concurrent_copy)
+    copy = FileCopy(source, source.stat(), dest, None)
+    copy_files([copy, copy], jobs=2)
+    assert [p.name for p in dest.parent.iterdir()] == ["code.py"]
+    assert dest.read_text() == "contents"
+
+
+def test_upload_logs_summary(
+    tmp_path: Path, monkeypatch: MonkeyPatch, caplog: LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+    create_file(source_dir, "a.txt")
+    upload([source_dir], mountpoint)
+    create_file(source_dir, "b.txt")
+
+    caplog.clear()
+    with caplog.at_level(logging.INFO):
+        upload([source_dir], mountpoint)
+    assert "Copied 1 of 2 files." in caplog.messages
+
+
+@mark.usefixtures("upload_method")
+def test_upload_follows_symlinks(tmp_path: Path) -> None:
+    """FAT has no symlinks, so the files they point to should be uploaded."""
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    mountpoint = tmp_path / "mountpoint"
+    mountpoint.mkdir()
+    target = tmp_path / "target.py"
+    target.write_text("contents")
+    (source_dir / "link.py").symlink_to(target)
+
+    upload([source_dir], mountpoint)
+
+    dest = mountpoint / "link.py"
+    assert not dest.is_symlink()
+    assert dest.read_text() == "contents"
+
+
+def test_upload_rsync(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """rsync should be used for uploads if available."""
+    monkeypatch.setattr(shutil, "which", lambda name: f"/bin/{name}")
+    commands: list[list[str]] = []
+
+    def fake_run(args: list[str], **kwargs: Any) -> None:
+        commands.append(args)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    upload([tmp_path / "a", tmp_path / "b"], tmp_path / "mountpoint")
+
+    [command] = commands
+    assert command[0] == "/bin/rsync"
+    assert "--inplace" in command
+    assert command[-3:] == [
+        f"{tmp_path}/a/",
+        f"{tmp_path}/b/",
+        f"{tmp_path}/mountpoint/",
+    ]
+
+
 def test_watch_all_file_modification(tmp_path: Path) -> None:
     root = tmp_path / "root"
     root.mkdir()
@@ -181,6 +506,39 @@ def test_watch_all_nested_dir(tmp_path: Path) -> None:
         (root / "a" / "b" / "create.txt").touch()
         assert (await next_modification()) == "a/b/create.txt"
 
+        # Directories moved into the tree should also be watched, including
+        # their subdirectories.
+        (tmp_path / "c" / "d").mkdir(parents=True)
+        (tmp_path / "c").rename(root / "a" / "c")
+        assert (await next_modification()) == "a/c"
+        (root / "a" / "c" / "create.txt").touch()
+        assert (await next_modification()) == "a/c/create.txt"
+        (root / "a" / "c" / "d" / "create.txt").touch()
+        assert (await next_modification()) == "a/c/d/create.txt"
+
+        # Subdirectories created along with a new directory (e.g. 'mkdir -p')
+        # may exist before the new directory is watched.
+        (root / "x" / "y" / "z").mkdir(parents=True)
+        assert (await next_modification()) == "x"
+        (root / "x" / "y" / "z" / "create.txt").touch()
+        while (path := await next_modification()) != "x/y/z/create.txt":
+            assert path in ("x/y", "x/y/z")
+
+    asyncio.run(body())
+
+
+def test_watch_all_symlink_created(tmp_path: Path) -> None:
+    """Symlinks don't get a CLOSE_WRITE event, so their creation is reported."""
+    root = tmp_path / "root"
+    root.mkdir()
+    (tmp_path / "target.txt").touch()
+
+    async def body() -> None:
+        modifications = watch_all([root])
+        (root / "link.txt").symlink_to(tmp_path / "target.txt")
+        path = await asyncio.wait_for(anext(modifications), 1)
+        assert path == root / "link.txt"
+
     asyncio.run(body())
 
 
@@ -206,3 +564,20 @@ def test_watch_all_track_new_dir(tmp_path: Path) -> None:
         assert (await next_modification()) == "a/b/create.txt"
 
     asyncio.run(body())
+
+
+def test_watch_all_file_moved_in(tmp_path: Path) -> None:
+    """Editors often save by writing a temporary file and renaming it into place."""
+    root = tmp_path / "root"
+    root.mkdir()
+    temp = tmp_path / "temp.txt"
+    temp.write_text("contents")
+
+    async def body() -> None:
+        modifications = watch_all([root])
+
+        temp.rename(root / "code.py")
+        modification = await asyncio.wait_for(anext(modifications), 1)
+        assert modification.relative_to(root) == Path("code.py")
+
+    asyncio.run(body())
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from pytest import MonkeyPatch, fixture
+
+from circuitpython_tool.hw import partition
+
+
+@fixture(autouse=True)
+def mountinfo(monkeypatch: MonkeyPatch, tmp_path: Path) -> Path:
+    """Inject fake /proc/self/mountinfo file."""
+    path = tmp_path / "mountinfo"
+    path.write_text(
+        "22 1 259:2 / / rw,relatime shared:1 - ext4 /dev/nvme0n1p2 rw\n"
+        "23 22 0:21 / /proc rw,nosuid - proc proc rw\n"
+    )
+    monkeypatch.setattr(partition, "MOUNTINFO_PATH", path)
+    return path
+
+
+def add_mount(mountinfo: Path, line: str) -> None:
+    with mountinfo.open("a") as f:
+        f.write(line + "\n")
+
+
+def test_not_mounted() -> None:
+    assert partition.mountpoint(Path("/dev/sda1")) is None
+
+
+def test_mounted(mountinfo: Path) -> None:
+    add_mount(
+        mountinfo,
+        "90 22 8:1 / /media/user/CIRCUITPY rw,nosuid shared:50 - vfat /dev/sda1 rw",
+    )
+    assert partition.mountpoint(Path("/dev/sda1")) == Path("/media/user/CIRCUITPY")
+
+
+def test_mounted_without_optional_fields(mountinfo: Path) -> None:
+    add_mount(mountinfo, "90 22 8:1 / /mnt rw - vfat /dev/sda1 rw")
+    assert partition.mountpoint(Path("/dev/sda1")) == Path("/mnt")
+
+
+def test_escaped_mountpoint(mountinfo: Path) -> None:
+    add_mount(mountinfo, r"90 22 8:1 / /media/my\040drive rw - vfat /dev/sda1 rw")
+    assert partition.mountpoint(Path("/dev/sda1")) == Path("/media/my drive")
+
+
+def test_symlinked_partition_path(mountinfo: Path, tmp_path: Path) -> None:
+    """Partition paths are often symlinks (e.g. in /dev/disk/by-id)."""
+    device = tmp_path / "sda1"
+    device.touch()
+    link = tmp_path / "usb-CircuitPython-part1"
+    link.symlink_to(device)
+    add_mount(mountinfo, f"90 22 8:1 / /mnt rw - vfat {device} rw")
+    assert partition.mountpoint(link) == Path("/mnt")
+
+
+def test_temporarily_mount(mountinfo: Path, monkeypatch: MonkeyPatch) -> None:
+    commands: list[str] = []
+
+    def fake_run(command: str) -> str:
+        commands.append(command)
+        if " mount " in command:
+            add_mount(mountinfo, "90 22 8:1 / /mnt rw - vfat /dev/sda1 rw")
+        return ""
+
+    monkeypatch.setattr(partition, "run", fake_run)
+    with partition.temporarily_mount(Path("/dev/sda1")) as mountpoint:
+        assert mountpoint == Path("/mnt")
+    assert [c.split()[1] for c in commands] == ["mount", "unmount"]
+
+
+def test_temporarily_mount_already_mounted(
+    mountinfo: Path, monkeypatch: MonkeyPatch
+) -> None:
+    add_mount(mountinfo, "90 22 8:1 / /mnt rw - vfat /dev/sda1 rw")
+    commands: list[str] = []
+    monkeypatch.setattr(partition, "run", commands.append)
+    with partition.temporarily_mount(Path("/dev/sda1")) as mountpoint:
+        assert mountpoint == Path("/mnt")
+    assert commands == []
+
+
+def test_mounted_by_device_number(mountinfo: Path, monkeypatch: MonkeyPatch) -> None:
+    """Block devices are matched by device number, not mount source."""
+    monkeypatch.setattr(partition, "device_number", lambda device: "8:1")
+    add_mount(mountinfo, "90 22 8:1 / /mnt rw - vfat /dev/root rw")
+    assert partition.mountpoint(Path("/dev/sda1")) == Path("/mnt")
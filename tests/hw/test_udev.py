@@ -1,3 +1,5 @@
+import os
+import time
 from pathlib import Path
 
 from pytest import MonkeyPatch, fixture
@@ -8,7 +10,7 @@ UsbDevice = udev.UsbDevice
 
 
 @fixture(autouse=True)
-def fake_udev(monkeypatch: MonkeyPatch) -> list[list[str]]:
+def fake_udev(monkeypatch: MonkeyPatch, tmp_path: Path) -> list[list[str]]:
     """Inject fake `udevadm info --export_db` implementation.
 
     Each entry corresponds to a sublist in this fixture's output. Each sublist
@@ -20,9 +22,45 @@ def fake_udev(monkeypatch: MonkeyPatch) -> list[list[str]]:
         return "\n\n".join("\n".join(e) for e in entries)
 
     monkeypatch.setattr(udev, "udevadm_export_db", fake_export_db)
+    # Force fallback to `udevadm`.
+    monkeypatch.setattr(udev, "UDEV_DATA_DIR", tmp_path / "nonexistent")
     return entries
 
 
+class FakeUdevDatabase:
+    """Fake udev database directory and corresponding sysfs entries."""
+
+    def __init__(self, base_path: Path) -> None:
+        self.data_dir = base_path / "udev_data"
+        self.data_dir.mkdir()
+        self.sysfs_dir = base_path / "sysfs"
+        self.sysfs_dir.mkdir()
+
+    def add(
+        self, name: str, devname: str, subsystem: str, properties: list[str]
+    ) -> None:
+        """Add database file `name` (e.g. 'b8:1') and its sysfs entries."""
+        (self.data_dir / name).write_text(
+            "\n".join(["I:12345", *(f"E:{p}" for p in properties)])
+        )
+        device_type = udev.DEVICE_TYPES[name[0]]
+        sysfs_path = self.sysfs_dir / device_type / name[1:]
+        sysfs_path.mkdir(parents=True)
+        (sysfs_path / "uevent").write_text(f"MAJOR=1\nMINOR=2\nDEVNAME={devname}\n")
+        subsystem_path = self.sysfs_dir / "class" / subsystem
+        subsystem_path.mkdir(parents=True, exist_ok=True)
+        (sysfs_path / "subsystem").symlink_to(subsystem_path)
+
+
+@fixture
+def fake_udev_database(monkeypatch: MonkeyPatch, tmp_path: Path) -> FakeUdevDatabase:
+    """Inject fake udev database directory."""
+    database = FakeUdevDatabase(tmp_path)
+    monkeypatch.setattr(udev, "UDEV_DATA_DIR", database.data_dir)
+    monkeypatch.setattr(udev, "SYSFS_DEV_DIR", database.sysfs_dir)
+    return database
+
+
 def test_empty_db() -> None:
     assert udev.UsbDevice.all() == []
 
@@ -143,3 +181,107 @@ def test_db_usb_entries(fake_udev: list[list[str]]) -> None:
             is_tty=True,
         ),
     ]
+
+
+def test_database_files(fake_udev_database: FakeUdevDatabase) -> None:
+    fake_udev_database.add(
+        "b8:1",
+        devname="sda1",
+        subsystem="block",
+        properties=[
+            "ID_BUS=usb",
+            "ID_USB_VENDOR_ID=0001",
+            "ID_USB_VENDOR=vendor1",
+            "ID_USB_MODEL_ID=1000",
+            "ID_USB_MODEL=model1",
+            "ID_USB_SERIAL_SHORT=serial1",
+            "ID_FS_LABEL=CIRCUITPY",
+        ],
+    )
+    fake_udev_database.add(
+        "c166:0",
+        devname="ttyACM0",
+        subsystem="tty",
+        properties=[
+            "ID_BUS=usb",
+            "ID_USB_VENDOR_ID=0001",
+            "ID_USB_VENDOR=vendor1",
+            "ID_USB_MODEL_ID=1000",
+            "ID_USB_MODEL=model1",
+            "ID_USB_SERIAL_SHORT=serial1",
+        ],
+    )
+    # Non-USB device.
+    fake_udev_database.add(
+        "b259:0", devname="nvme0n1", subsystem="block", properties=["ID_BUS=nvme"]
+    )
+    # Entries that don't correspond to device nodes should be ignored.
+    (fake_udev_database.data_dir / "+usb:1-1").write_text("E:ID_BUS=usb")
+    (fake_udev_database.data_dir / "n3").write_text("E:ID_BUS=usb")
+
+    assert sorted(UsbDevice.all(), key=lambda d: d.path) == [
+        UsbDevice(
+            path=Path("/dev/sda1"),
+            vendor_id="0001",
+            vendor="vendor1",
+            model_id="1000",
+            model="model1",
+            serial="serial1",
+            partition_label="CIRCUITPY",
+        ),
+        UsbDevice(
+            path=Path("/dev/ttyACM0"),
+            vendor_id="0001",
+            vendor="vendor1",
+            model_id="1000",
+            model="model1",
+            serial="serial1",
+            is_tty=True,
+        ),
+    ]
+
+
+def test_database_cache(fake_udev_database: FakeUdevDatabase) -> None:
+    data_dir = fake_udev_database.data_dir
+
+    def set_age(seconds: int) -> None:
+        """Backdate database modification time to be outside the racy window."""
+        timestamp = time.time_ns() - seconds * 1_000_000_000
+        os.utime(data_dir, ns=(timestamp, timestamp))
+
+    def add_device(name: str, devname: str) -> None:
+        fake_udev_database.add(
+            name,
+            devname=devname,
+            subsystem="block",
+            properties=[
+                "ID_BUS=usb",
+                "ID_USB_VENDOR_ID=0001",
+                "ID_USB_VENDOR=vendor",
+                "ID_USB_MODEL_ID=1000",
+                "ID_USB_MODEL=model",
+                "ID_USB_SERIAL=serial",
+            ],
+        )
+
+    def all_paths() -> list[str]:
+        return sorted(str(d.path) for d in UsbDevice.all())
+
+    add_device("b8:1", "sda1")
+    set_age(100)
+    assert all_paths() == ["/dev/sda1"]
+
+    # Modification time unchanged; cached result should be used.
+    stat = data_dir.stat()
+    add_device("b8:2", "sda2")
+    os.utime(data_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert all_paths() == ["/dev/sda1"]
+
+    # Modification time changed; database should be rescanned.
+    set_age(50)
+    assert all_paths() == ["/dev/sda1", "/dev/sda2"]
+
+    # Recent modifications should always be rescanned.
+    add_device("b8:3", "sda3")
+    os.utime(data_dir, ns=(stat.st_atime_ns, time.time_ns()))
+    assert all_paths() == ["/dev/sda1", "/dev/sda2", "/dev/sda3"]
@@ -0,0 +1,22 @@
+import sys
+
+import pytest
+
+from circuitpython_tool import __main__
+from circuitpython_tool.cli import commands
+
+CaptureFixture = pytest.CaptureFixture[str]
+
+
+@pytest.mark.parametrize("flag", __main__.VERSION_FLAGS)
+def test_version_matches_cli(
+    flag: str, capsys: CaptureFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The fast path should print exactly what the full CLI would."""
+    with pytest.raises(SystemExit):
+        commands.main([flag])
+    expected = capsys.readouterr().out
+
+    monkeypatch.setattr(sys, "argv", ["circuitpython-tool", flag])
+    __main__.main()
+    assert capsys.readouterr().out == expected
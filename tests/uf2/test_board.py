@@ -118,6 +118,18 @@ def test_multiple_boards(fake_boards_json: FakeBoardsJson) -> None:
     ]
 
 
+def test_boards_parsed_once(fake_boards_json: FakeBoardsJson) -> None:
+    fake_boards_json.add_board("a").add_version("v1", stable=True, languages=["en_US"])
+
+    [first] = Board.all()
+    [second] = Board.all()
+    assert first is second
+
+    # Changes to the JSON are still picked up.
+    fake_boards_json.add_board("b").add_version("v1", stable=True, languages=["en_US"])
+    assert [b.id for b in Board.all()] == ["a", "b"]
+
+
 def test_all_languages(fake_boards_json: FakeBoardsJson) -> None:
     # One board with multiple English locales in a single version
     fake_boards_json.add_board("english").add_version(